@@ -1,24 +1,22 @@
 import io
 import os
 import time
+import asyncio
+import threading
 import gspread
 import discord
 import traceback
 import numpy as np
 import pandas as pd
-import seaborn as sns
 from dotenv import load_dotenv
-from calendar import monthrange
-import matplotlib.pyplot as plt
 from discord.ext import commands
 from discord import app_commands
-import matplotlib.dates as mdates
-import matplotlib.ticker as mticker
 from collections import defaultdict
+from functools import lru_cache
 from typing import Optional, Literal
-from datetime import datetime, timedelta
-from matplotlib.colors import LinearSegmentedColormap
+from datetime import date, datetime, timedelta, timezone
 from oauth2client.service_account import ServiceAccountCredentials
+from google.auth.transport.requests import Request
 from discord import ui
 
 # Load environment variables
@@ -28,25 +26,44 @@ load_dotenv()
 intents = discord.Intents.default()
 intents.message_content = True
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+class ExpenseBot(commands.Bot):
+    async def setup_hook(self):
+        global _write_queue, _write_worker_task, _token_refresh_task
+        # Runs once before connecting, so the write queue exists before any command can arrive
+        _write_queue = asyncio.Queue()
+        _write_worker_task = asyncio.create_task(_write_worker())
+        _token_refresh_task = asyncio.create_task(_refresh_token_loop())
 
-# Google Sheets setup with rate limiting
-class RateLimitedClient:
-    def __init__(self, client):
-        self.client = client
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # At least 1 second between requests
+    async def close(self):
+        # Users were told their entries were recorded, so write out anything still queued first
+        try:
+            await flush_writes(timeout=WRITE_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"Gave up waiting for {_write_queue.qsize()} queued row(s) to be written")
+        await super().close()
 
-    def get_spreadsheet(self, spreadsheet_id):
-        self._wait_for_rate_limit()
-        return self.client.open_by_key(spreadsheet_id)
-    
-    def _wait_for_rate_limit(self):
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+bot = ExpenseBot(command_prefix='!', intents=intents)
+
+# Google Sheets rate limiting: a token bucket taken by each API request. Requests only run in
+# executor worker threads (see _sheets_call), so waiting for a token never blocks the event loop
+class RateLimiter:
+    def __init__(self, rate=1.0, capacity=10):
+        self.rate = rate  # Tokens replenished per second
+        self.capacity = capacity  # Maximum burst of back-to-back requests
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
 
 # Set up Google Sheets with rate limiting
 scope = ['https://spreadsheets.google.com/feeds',
@@ -54,13 +71,59 @@ scope = ['https://spreadsheets.google.com/feeds',
 credentials = ServiceAccountCredentials.from_json_keyfile_name(
     os.getenv('GOOGLE_SHEETS_CREDENTIALS_FILE'), scope)
 client = gspread.authorize(credentials)
-rate_limited_client = RateLimitedClient(client)
+sheets_limiter = RateLimiter(rate=1.0, capacity=10)
+MAX_RETRY_DELAY = 60  # Seconds, cap for backing off after a 429 response
+
+TOKEN_REFRESH_MARGIN = 60  # Seconds before expiry to refresh the access token
+_token_refresh_task = None
+
+# Refresh the access token ahead of expiry so no command waits on the OAuth round trip
+async def _refresh_token_loop():
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, client.auth.refresh, Request())
+            expiry = client.auth.expiry  # Naive UTC datetime
+            now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+            wait = (expiry - now_utc).total_seconds() - TOKEN_REFRESH_MARGIN if expiry else 45 * 60
+        except Exception as e:
+            print(f"Error refreshing Google Sheets token: {e}")
+            wait = TOKEN_REFRESH_MARGIN
+        await asyncio.sleep(max(wait, TOKEN_REFRESH_MARGIN))
+
+# Make one Google Sheets API request under the rate limit, retrying with exponential backoff
+# (or the server's Retry-After) when the quota is exhausted. Blocking: call from a worker thread
+def _sheets_request(fn, *args, **kwargs):
+    delay = 1.0
+    while True:
+        sheets_limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code != 429 or delay > MAX_RETRY_DELAY:
+                raise
+            retry_after = e.response.headers.get('Retry-After', '')
+            wait = min(float(retry_after) if retry_after.isdigit() else delay, MAX_RETRY_DELAY)
+            print(f"Google Sheets quota exceeded, retrying in {wait:.0f}s")
+            time.sleep(wait)
+            delay *= 2
+
+# Run blocking Sheets or cache work in a worker thread so it doesn't stall the event loop
+# (cache hits never touch the rate limiter; only the API requests inside do)
+async def _sheets_call(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: fn(*args, **kwargs))
 
 # Spreadsheet properties
 HEADERS = ['User', 'Amount', 'Description', 'Category', 'Type', 'Date']
+CATEGORICAL_COLUMNS = ['User', 'Category']  # Low-cardinality columns stored as pandas categoricals
+TYPE_DTYPE = pd.CategoricalDtype(['Income', 'Expense'])  # Fixed categories keep Type codes identical across loads
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'  # Format the bot writes timestamps in
+DATE_BUCKET_COLUMNS = ['_Day', '_YM']  # Integer date keys derived at load time (not stored in the sheet)
+NAT_DAY = np.iinfo(np.int64).min  # _Day value of rows whose Date could not be parsed
 
 try:
-    spreadsheet = rate_limited_client.get_spreadsheet(os.getenv('SPREADSHEET_ID'))
+    spreadsheet = client.open_by_key(os.getenv('SPREADSHEET_ID'))
     worksheet = spreadsheet.sheet1
 except Exception as e:
     print(f"Error connecting to Google Sheets: {e}")
@@ -75,21 +138,24 @@ def ensure_headers():
     try:
         # Get current headers or initialize if sheet is empty
         try:
-            current_headers = worksheet.row_values(1)
+            current_headers = _sheets_request(worksheet.row_values, 1)
             if not current_headers:  # Empty row
-                worksheet.insert_row(HEADERS, 1)
+                _sheets_request(worksheet.insert_row, HEADERS, 1)
+                invalidate_cache()
                 print("Initialized empty sheet with headers")
                 return True
         except IndexError:  # No rows in sheet
-            worksheet.insert_row(HEADERS, 1)
+            _sheets_request(worksheet.insert_row, HEADERS, 1)
+            invalidate_cache()
             print("Created headers in empty sheet")
             return True
             
         # Check if headers match expected format
         if current_headers != HEADERS:
             # Clear the first row and insert correct headers
-            worksheet.delete_row(1)
-            worksheet.insert_row(HEADERS, 1)
+            _sheets_request(worksheet.delete_row, 1)
+            _sheets_request(worksheet.insert_row, HEADERS, 1)
+            invalidate_cache()
             print(f"Updated headers from {current_headers} to {HEADERS}")
             
         return True
@@ -98,76 +164,342 @@ def ensure_headers():
         traceback.print_exc()
         return False
 
-# Process records into a proper DataFrame
+# Headers are verified once at startup; commands only re-check if that failed
+_headers_ok = False
+
+def ensure_headers_once():
+    global _headers_ok
+    if not _headers_ok:
+        _headers_ok = ensure_headers()
+    return _headers_ok
+
+# In-memory cache for sheet data (avoids a full Sheets fetch on every command)
+_CACHE_TTL = 30  # Seconds before cached records are considered stale
+_FULL_REFRESH_INTERVAL = 300  # Seconds between full downloads (picks up edits made directly in the sheet)
+_records_cache = {'df': None, 'ts': 0.0, 'rows': 0, 'full_ts': 0.0, 'agg': None, 'by_date': None}
+_categories_cache = {'categories': None, 'index': None}  # Built from _known_categories, dropped when it changes
+_known_categories = set()  # Distinct categories, rebuilt on load and extended on every write
+_slice_cache = {}  # (user, period, day) -> (filtered DataFrame, period text) for charts
+_records_lock = threading.Lock()  # Stops concurrent commands from refreshing the sheet at the same time
+
+def invalidate_cache():
+    """Drop all cached data (use after existing rows are edited or deleted)"""
+    _records_cache.update(df=None, ts=0.0, rows=0, full_ts=0.0)
+    _reset_derived()
+    _categories_cache.update(categories=None, index=None)
+
+def _reset_derived():
+    """Drop everything computed from the cached records"""
+    _records_cache.update(agg=None, by_date=None)
+    _slice_cache.clear()
+
+def expire_cache():
+    """Mark cached data stale so the next read only fetches newly appended rows"""
+    _records_cache['ts'] = 0.0
+
+# Patch one entry's category in the cached records instead of dropping the whole cache
+def update_cached_category(entry_id, category):
+    df = _records_cache['df']
+    if df is None or not 1 <= entry_id <= len(df):
+        invalidate_cache()
+        return
+    
+    if category not in df['Category'].cat.categories:
+        df['Category'] = df['Category'].cat.add_categories([category])
+    df.iat[entry_id - 1, df.columns.get_loc('Category')] = category
+    _reset_derived()
+    add_known_category(category)
+
+# Remember a category as soon as it is written, so listing categories never rescans the records
+def add_known_category(category):
+    if category not in _known_categories:
+        _known_categories.add(category)
+        _categories_cache.update(categories=None, index=None)
+
+def _index_categories(df):
+    _known_categories.clear()
+    if not df.empty:
+        _known_categories.update(df['Category'].cat.categories)
+    _categories_cache.update(categories=None, index=None)
+
+# Process records into a proper DataFrame (served from cache while fresh)
 def get_processed_records():
     if worksheet is None:
         return pd.DataFrame(columns=HEADERS)
-        
-    try:
-        # Get all data from sheet
-        all_values = worksheet.get_all_values()
-        
-        # Handle empty sheet
-        if not all_values:
-            ensure_headers()
-            return pd.DataFrame(columns=HEADERS)
-            
-        # Get header row
-        headers = all_values[0]
-        
-        # Get all data rows
-        data_rows = all_values[1:] if len(all_values) > 1 else []
-        
-        # Create DataFrame
-        df = pd.DataFrame(data_rows, columns=headers)
-        
-        # Handle empty DataFrame
-        if df.empty:
-            return pd.DataFrame(columns=HEADERS)
+    
+    cached_df = _records_cache['df']
+    if cached_df is not None and time.time() - _records_cache['ts'] < _CACHE_TTL:
+        return cached_df.copy(deep=False)
+    
+    with _records_lock:
+        # Another thread may have refreshed the cache while we waited for the lock
+        now = time.time()
+        cached_df = _records_cache['df']
+        if cached_df is not None:
+            if now - _records_cache['ts'] < _CACHE_TTL:
+                return cached_df.copy(deep=False)
             
-        # Ensure Amount column is numeric
-        df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
-        
-        # Handle NaN values
-        df = df.fillna({'Amount': 0, 'Category': 'Uncategorized', 'Type': 'Expense'})
+            # Only pull rows appended since the last fetch while a full download is recent enough
+            if _records_cache['rows'] and now - _records_cache['full_ts'] < _FULL_REFRESH_INTERVAL:
+                df = _fetch_new_records(cached_df)
+                if df is cached_df:
+                    # Nothing was appended, so the derived data is still valid
+                    _records_cache['ts'] = now
+                    return df.copy(deep=False)
+                if df is not None:
+                    _records_cache.update(df=df, ts=now)
+                    _reset_derived()
+                    _index_categories(df)
+                    return df.copy(deep=False)
         
-        # Ensure Date column is datetime
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        try:
+            df, rows = _fetch_processed_records()
+        except Exception as e:
+            print(f"Error processing records: {e}")
+            traceback.print_exc()
+            if cached_df is None:
+                raise
+            # Keep serving the last good records; the next read retries the fetch
+            return cached_df.copy(deep=False)
+        
+        _records_cache.update(df=df, ts=now, rows=rows, full_ts=now)
+        _reset_derived()
+        _index_categories(df)
+        return df.copy(deep=False)
+
+def _build_records_frame(data_rows, headers):
+    # Handle empty DataFrame
+    if not data_rows:
+        return pd.DataFrame(columns=HEADERS)
+    
+    # Create DataFrame column by column straight into Arrow-backed strings
+    # (skips the intermediate 2-D object array that building from a list of rows allocates)
+    df = pd.DataFrame({
+        header: pd.array(list(column), dtype='string[pyarrow]')
+        for header, column in zip(headers, zip(*data_rows))
+    })
+        
+    # Ensure Amount column is numeric (plain float64, string input would otherwise give nullable Float64/Int64)
+    df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').astype('float64')
+    
+    # Handle NaN values
+    df = df.fillna({'Amount': 0, 'Category': 'Uncategorized', 'Type': 'Expense'})
+    
+    # Store repeated strings as categoricals so filters and groupbys compare integer codes
+    df[CATEGORICAL_COLUMNS] = df[CATEGORICAL_COLUMNS].astype('category')
+    
+    # Unrecognized types (e.g. typed by hand in the sheet) become NaN and are left out of the totals
+    df['Type'] = df['Type'].astype(TYPE_DTYPE)
+    
+    # Ensure Date column is datetime (explicit format uses the fast parser instead of per-value inference)
+    dates = pd.to_datetime(df['Date'], format=DATE_FORMAT, errors='coerce')
+    
+    # Older rows may have been reformatted by Sheets when written as user-entered values
+    unparsed = dates.isna() & df['Date'].ne('')
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(df.loc[unparsed, 'Date'], errors='coerce')
+    df['Date'] = dates
+    
+    return _add_date_buckets(df)
+
+def _add_date_buckets(df):
+    """Derive integer day (days since epoch) and year*100+month columns from Date once per load"""
+    days = df['Date'].values.astype('datetime64[D]')
+    months = days.astype('datetime64[M]').view('i8')
+    df['_Day'] = days.view('i8')  # NaT becomes NAT_DAY, which never falls inside a period
+    df['_YM'] = np.where(np.isnat(days), 0, (months // 12 + 1970) * 100 + months % 12 + 1).astype(np.int32)
+    return df
+
+def _day_number(value):
+    """Days since the epoch for a date or timestamp, matching the _Day column"""
+    return np.datetime64(value, 'D').astype(np.int64)
+
+def _fetch_processed_records():
+    """Download the whole sheet, returning the DataFrame and the number of sheet rows read (errors propagate)"""
+    # Get all data from sheet
+    all_values = _sheets_request(worksheet.get_all_values)
+    
+    # Handle empty sheet
+    if not all_values:
+        ensure_headers()
+        return pd.DataFrame(columns=HEADERS), 0
         
+    # Get header row
+    headers = all_values[0]
+    
+    # Get all data rows
+    data_rows = all_values[1:] if len(all_values) > 1 else []
+    
+    return _build_records_frame(data_rows, headers), len(all_values)
+
+def _fetch_new_records(cached_df):
+    """Append rows added to the sheet since the last fetch, or return None to force a full fetch"""
+    try:
+        first_new_row = _records_cache['rows'] + 1
+        new_values = _sheets_request(worksheet.get, f'A{first_new_row}:F')
+        _records_cache['rows'] += len(new_values)
+        if not new_values:
+            return cached_df
+        
+        # The API trims trailing empty cells, so pad rows back to the full width
+        headers = [column for column in cached_df.columns if column not in DATE_BUCKET_COLUMNS]
+        width = len(headers)
+        data_rows = [row + [''] * (width - len(row)) for row in new_values]
+        new_df = _build_records_frame(data_rows, headers)
+        if cached_df.empty:
+            return new_df
+        df = pd.concat([cached_df, new_df], ignore_index=True)
+        
+        # Concatenating categoricals with different categories falls back to object dtype
+        df[CATEGORICAL_COLUMNS] = df[CATEGORICAL_COLUMNS].astype('category')
         return df
     except Exception as e:
-        print(f"Error processing records: {e}")
+        print(f"Error fetching new records: {e}")
         traceback.print_exc()
-        return pd.DataFrame(columns=HEADERS)
+        return None
+
+# Get the [start, end) datetime bounds and display text for a period
+def get_period_bounds(period, now=None):
+    now = now or datetime.now()
+    if period.lower() == 'month':
+        start = pd.Timestamp(year=now.year, month=now.month, day=1)
+        return start, start + pd.offsets.MonthBegin(1), 'this month'
+    if period.lower() == 'week':
+        start = pd.Timestamp(now.date() - timedelta(days=now.weekday()))
+        return start, start + pd.Timedelta(days=7), 'this week'
+    return None, None, 'all time'
+
+# Filter records to a period by comparing the precomputed integer date columns
+def filter_by_period(df, period, now=None):
+    start, end, period_text = get_period_bounds(period, now)
+    if period.lower() == 'month':
+        df = df[df['_YM'].values == start.year * 100 + start.month]
+    elif start is not None:
+        days = df['_Day'].values
+        df = df[(days >= _day_number(start)) & (days < _day_number(end))]
+    return df, period_text
+
+# Amount totals indexed by (User, Date, Type, Category), rebuilt only when the cached records change
+def get_amount_aggregate():
+    get_processed_records()  # Refresh the records cache if it has gone stale
+    agg = _records_cache['agg']
+    if agg is None:
+        df = _records_cache['df']
+        if df is None or df.empty:
+            agg = pd.Series(dtype='float64')
+        else:
+            agg = df.groupby(['User', 'Date', 'Type', 'Category'], observed=True, dropna=False)['Amount'].sum()
+        _records_cache['agg'] = agg
+    return agg
+
+# Records sorted newest first (original index kept), rebuilt only when the cached records change
+def get_records_by_date():
+    df = get_processed_records()
+    by_date = _records_cache['by_date']
+    if by_date is None:
+        by_date = df.sort_values('Date', ascending=False, kind='stable')
+        if _records_cache['df'] is not None:
+            _records_cache['by_date'] = by_date
+    return by_date.copy(deep=False)
+
+# Get a user's totals for a period indexed by (Type, Category), or None if the user has no records
+def get_user_totals(agg, user, period, now=None):
+    start, end, period_text = get_period_bounds(period, now)
+    try:
+        user_agg = agg.xs(user, level='User')
+    except KeyError:
+        return None, period_text
+    
+    if start is not None:
+        dates = user_agg.index.get_level_values('Date')
+        user_agg = user_agg[(dates >= start) & (dates < end)]
+    
+    return user_agg.groupby(level=['Type', 'Category'], observed=True).sum(), period_text
 
 # Helper functions
 def get_categories():
     try:
-        df = get_processed_records()
-        if 'Category' in df.columns:
-            categories = df['Category'].unique().tolist()
-            if categories:
-                return categories
+        get_processed_records()  # Reloads the records (and known categories) if the cache is stale
+        if _known_categories:
+            return list(_known_categories)
     except Exception as e:
         print(f"Error getting categories: {e}")
     
     # Default categories if retrieval fails
     return ['Food', 'Transportation', 'Utilities', 'Entertainment', 'Shopping', 'Salary', 'Gifts', 'Other']
 
-# Get all available categories for autocomplete
+# Get all available categories for autocomplete (built from the known categories in memory,
+# never from Sheets: autocomplete fires on every keystroke and has a 3 second deadline)
 def get_all_categories():
-    custom_categories = get_categories()
+    cached_categories = _categories_cache['categories']
+    if cached_categories is not None:
+        return cached_categories
+    
     default_categories = ['Food', 'Transportation', 'Utilities', 'Entertainment', 'Shopping', 'Salary', 'Gifts', 'Other']
     
-    # Combine and deduplicate
-    all_categories = list(set(custom_categories + default_categories))
-    all_categories.sort()
+    # Combine and deduplicate (copy the set first, a worker thread may be reloading it)
+    all_categories = sorted(set(_known_categories).union(default_categories))
+    
+    # Lowercase once here so autocomplete doesn't redo it on every keystroke
+    index = [(category.lower(), category) for category in all_categories]
+    _categories_cache.update(categories=all_categories, index=index)
     return all_categories
 
+# Batched sheet writes: new rows are queued and flushed together with a single append_rows call
+WRITE_BATCH_SIZE = 20  # Flush as soon as this many rows are queued
+WRITE_BATCH_MAX_WAIT = 2.0  # Seconds to wait for more rows before flushing a partial batch
+WRITE_FLUSH_TIMEOUT = 30  # Seconds to wait for queued rows to be written on shutdown
+_write_queue = None
+_write_worker_task = None
+
+def queue_row(author, row):
+    """Queue a row for the next batched append to the sheet"""
+    _write_queue.put_nowait((author, row))
+    add_known_category(row[3])
+
+async def flush_writes(timeout=None):
+    """Wait until every queued row has been written to the sheet (or its write has failed)"""
+    if _write_queue is not None:
+        await asyncio.wait_for(_write_queue.join(), timeout)
+
+async def _write_worker():
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _write_queue.get()]
+        deadline = loop.time() + WRITE_BATCH_MAX_WAIT
+        
+        # Collect more rows until the batch is full or the wait expires
+        while len(batch) < WRITE_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_write_queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        rows = [row for _, row in batch]
+        try:
+            await _sheets_call(_sheets_request, worksheet.append_rows, rows, value_input_option='RAW', insert_data_option='INSERT_ROWS')
+        except Exception as e:
+            print(f"Error flushing {len(rows)} queued row(s): {e}")
+            traceback.print_exc()
+            # Let each affected user know their entry was not saved
+            for author, row in batch:
+                try:
+                    await author.send(f'Sorry, your {row[4].lower()} of ${row[1]:.2f} for "{row[2]}" could not be saved: {str(e)}')
+                except Exception as dm_error:
+                    print(f"Could not notify {author} about failed write: {dm_error}")
+        finally:
+            expire_cache()
+            for _ in batch:
+                _write_queue.task_done()
+
 @bot.event
 async def on_ready():
     print(f'{bot.user} has connected to Discord!')
-    if ensure_headers():
+    
+    if await _sheets_call(ensure_headers_once):
         print("Headers are properly set up in the Google Sheet")
     else:
         print("Warning: Could not set up headers in Google Sheet")
@@ -181,10 +513,13 @@ async def on_ready():
 
 # Category autocomplete
 async def category_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-    categories = get_all_categories()
+    # Purely in memory: the records are refreshed by commands, never from here
+    get_all_categories()
+    
+    query = current.lower()
     return [
         app_commands.Choice(name=category, value=category)
-        for category in categories if current.lower() in category.lower()
+        for lowered, category in _categories_cache['index'] or [] if query in lowered
     ][:25]  # Discord limits choices to 25
 
 # Traditional commands (keep these for backward compatibility)
@@ -197,11 +532,13 @@ async def add_expense_prefix(ctx, amount: float, *, description: str):
     
     try:
         # Ensure headers before adding data
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Add the expense to the sheet
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        worksheet.append_row([str(ctx.author), str(amount), description, 'Uncategorized', 'Expense', current_time])
+        # Queue the expense for the next batched write to the sheet
+        user_key = str(ctx.author)
+        current_time = datetime.now().strftime(DATE_FORMAT)
+        queue_row(ctx.author, [user_key, amount, description, 'Uncategorized', 'Expense', current_time])
         await ctx.send(f'Expense of ${amount:.2f} for "{description}" has been recorded!')
     except Exception as e:
         await ctx.send(f'Error recording expense: {str(e)}')
@@ -217,11 +554,13 @@ async def add_income_prefix(ctx, amount: float, *, description: str):
     
     try:
         # Ensure headers before adding data
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Add the income to the sheet
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        worksheet.append_row([str(ctx.author), str(amount), description, 'Uncategorized', 'Income', current_time])
+        # Queue the income for the next batched write to the sheet
+        user_key = str(ctx.author)
+        current_time = datetime.now().strftime(DATE_FORMAT)
+        queue_row(ctx.author, [user_key, amount, description, 'Uncategorized', 'Income', current_time])
         await ctx.send(f'Income of ${amount:.2f} for "{description}" has been recorded!')
     except Exception as e:
         await ctx.send(f'Error recording income: {str(e)}')
@@ -243,15 +582,18 @@ async def add_expense(interaction: discord.Interaction, amount: float, descripti
     
     try:
         # Ensure headers before adding data
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
         # Use N/A if description is empty
         if not description or description.strip() == "":
             description = "N/A"
         
-        # Add the expense to the sheet
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        worksheet.append_row([str(interaction.user), str(amount), description, category, 'Expense', current_time])
+        # Queue the expense for the next batched write to the sheet
+        user_key = str(interaction.user)
+        now = datetime.now()
+        current_time = now.strftime(DATE_FORMAT)
+        queue_row(interaction.user, [user_key, amount, description, category, 'Expense', current_time])
         
         # Create confirmation embed
         embed = discord.Embed(
@@ -266,10 +608,10 @@ async def add_expense(interaction: discord.Interaction, amount: float, descripti
         embed.add_field(name="Category", value=f"📚 {category}", inline=True)
         
         # Add footer with timestamp
-        embed.set_footer(text=f"Tracked by ExpenseBot • {datetime.now().strftime('%b %d, %Y at %I:%M %p')}")
+        embed.set_footer(text=f"Tracked by ExpenseBot • {now.strftime('%b %d, %Y at %I:%M %p')}")
         
         # Create and send view with buttons
-        view = ExpenseConfirmView(interaction, amount, description, category)
+        view = ExpenseConfirmView(interaction, amount, description, category, current_time)
         await interaction.response.send_message(embed=embed, view=view)
         
     except Exception as e:
@@ -291,15 +633,17 @@ async def add_income(interaction: discord.Interaction, amount: float, descriptio
     
     try:
         # Ensure headers before adding data
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
         # Use N/A if description is empty
         if not description or description.strip() == "":
             description = "N/A"
         
-        # Add the income to the sheet
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        worksheet.append_row([str(interaction.user), str(amount), description, category, 'Income', current_time])
+        # Queue the income for the next batched write to the sheet
+        user_key = str(interaction.user)
+        current_time = datetime.now().strftime(DATE_FORMAT)
+        queue_row(interaction.user, [user_key, amount, description, category, 'Income', current_time])
         await interaction.response.send_message(f'Income of ${amount:.2f} from "{description}" has been recorded in category "{category}"!')
     except Exception as e:
         await interaction.response.send_message(f'Error recording income: {str(e)}')
@@ -317,24 +661,29 @@ async def set_category(interaction: discord.Interaction, entry_id: int, category
         await interaction.response.send_message("Google Sheets connection is not available. Please check the bot logs.")
         return
     
+    # Acknowledge right away so slow Sheets calls don't hit Discord's 3 second response limit
+    await interaction.response.defer(thinking=True)
+    
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Get all records
-        all_values = worksheet.get_all_values()
-        if len(all_values) <= 1:  # Only header row or empty
-            await interaction.response.send_message("No entries found to categorize.")
+        # Count entries from the cached records rather than downloading the whole sheet
+        entry_count = len(await _sheets_call(get_processed_records))
+        if entry_count == 0:
+            await interaction.followup.send("No entries found to categorize.")
             return
             
-        if 1 <= entry_id <= len(all_values) - 1:
+        if 1 <= entry_id <= entry_count:
             # Update the category (add 1 because entry_id is 1-indexed, and we skip header row)
-            worksheet.update_cell(entry_id + 1, 4, category)
-            await interaction.response.send_message(f'Category for entry #{entry_id} has been set to "{category}"')
+            await _sheets_call(_sheets_request, worksheet.update_cell, entry_id + 1, 4, category)
+            update_cached_category(entry_id, category)
+            await interaction.followup.send(f'Category for entry #{entry_id} has been set to "{category}"')
         else:
-            await interaction.response.send_message(f'Invalid entry ID. Please use a number between 1 and {len(all_values) - 1}')
+            await interaction.followup.send(f'Invalid entry ID. Please use a number between 1 and {entry_count}')
     except Exception as e:
-        await interaction.response.send_message(f'Error setting category: {str(e)}')
+        await interaction.followup.send(f'Error setting category: {str(e)}')
         print(f"Error in set_category: {e}")
         traceback.print_exc()
 
@@ -352,57 +701,53 @@ async def balance(interaction: discord.Interaction, period: str = 'all'):
         await interaction.response.send_message("Google Sheets connection is not available. Please check the bot logs.")
         return
     
+    # Acknowledge right away so slow Sheets calls don't hit Discord's 3 second response limit
+    await interaction.response.defer(thinking=True)
+    
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Get processed records
-        df = get_processed_records()
+        # Get precomputed totals
+        agg = await _sheets_call(get_amount_aggregate)
         
         # Check if there's data
-        if df.empty:
-            await interaction.response.send_message("No transactions found.")
+        if agg.empty:
+            await interaction.followup.send("No transactions found.")
             return
         
-        # Filter by user
-        df = df[df['User'] == str(interaction.user)]
+        # Select this user's totals for the period
+        totals, period_text = get_user_totals(agg, str(interaction.user), period)
         
-        if df.empty:
-            await interaction.response.send_message("You have no recorded transactions.")
+        if totals is None:
+            await interaction.followup.send("You have no recorded transactions.")
             return
 
-        # Filter by period
-        if period.lower() == 'month':
-            current_month = datetime.now().strftime('%Y-%m')
-            df = df[df['Date'].dt.strftime('%Y-%m') == current_month]
-            period_text = 'this month'
-        elif period.lower() == 'week':
-            current_week = datetime.now().isocalendar()[1]
-            df = df[df['Date'].dt.isocalendar().week == current_week]
-            period_text = 'this week'
-        else:
-            period_text = 'all time'
-
         # Calculate income and expenses
-        income = df[df['Type'] == 'Income']['Amount'].sum()
-        expenses = df[df['Type'] == 'Expense']['Amount'].sum()
+        type_totals = totals.groupby(level='Type', observed=True).sum()
+        income = type_totals.get('Income', 0)
+        expenses = type_totals.get('Expense', 0)
         balance = income - expenses
         
-        message = f"**Balance Summary for {period_text}:**\n"
-        message += f"Total Income: ${income:.2f}\n"
-        message += f"Total Expenses: ${expenses:.2f}\n"
-        message += f"**Net Balance: ${balance:.2f}**"
+        parts = [
+            f"**Balance Summary for {period_text}:**",
+            f"Total Income: ${income:.2f}",
+            f"Total Expenses: ${expenses:.2f}",
+            f"**Net Balance: ${balance:.2f}**"
+        ]
         
         if balance > 0:
-            message += "\n✅ You're in the green! Keep it up!"
+            parts.append("✅ You're in the green! Keep it up!")
         elif balance < 0:
-            message += "\n❌ You're spending more than you earn."
+            parts.append("❌ You're spending more than you earn.")
         else:
-            message += "\n⚖️ Your budget is perfectly balanced."
+            parts.append("⚖️ Your budget is perfectly balanced.")
+        message = "\n".join(parts)
             
-        await interaction.response.send_message(message)
+        await interaction.followup.send(message)
     except Exception as e:
-        await interaction.response.send_message(f'Error calculating balance: {str(e)}')
+        await interaction.followup.send(f'Error calculating balance: {str(e)}')
         print(f"Error in balance: {e}")
         traceback.print_exc()
 
@@ -426,53 +771,46 @@ async def total_entries(interaction: discord.Interaction, period: str = 'all', t
         await interaction.response.send_message("Google Sheets connection is not available. Please check the bot logs.")
         return
     
+    # Acknowledge right away so slow Sheets calls don't hit Discord's 3 second response limit
+    await interaction.response.defer(thinking=True)
+    
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Get processed records
-        df = get_processed_records()
+        # Get precomputed totals
+        agg = await _sheets_call(get_amount_aggregate)
         
         # Check if there's data
-        if df.empty:
-            await interaction.response.send_message("No transactions found.")
+        if agg.empty:
+            await interaction.followup.send("No transactions found.")
             return
 
-        # Filter by user
-        df = df[df['User'] == str(interaction.user)]
+        # Select this user's totals for the period
+        totals, period_text = get_user_totals(agg, str(interaction.user), period)
         
-        if df.empty:
-            await interaction.response.send_message("You have no recorded transactions.")
+        if totals is None:
+            await interaction.followup.send("You have no recorded transactions.")
             return
 
-        # Filter by period
-        if period.lower() == 'month':
-            current_month = datetime.now().strftime('%Y-%m')
-            df = df[df['Date'].dt.strftime('%Y-%m') == current_month]
-            period_text = 'this month'
-        elif period.lower() == 'week':
-            current_week = datetime.now().isocalendar()[1]
-            df = df[df['Date'].dt.isocalendar().week == current_week]
-            period_text = 'this week'
-        else:
-            period_text = 'all time'
-
         # Filter by transaction type
+        type_totals = totals.groupby(level='Type', observed=True).sum()
         if type != 'All':
-            df = df[df['Type'] == type]
+            type_totals = type_totals[type_totals.index == type]
         
         # Check if data exists after filtering
-        if df.empty:
+        if type_totals.empty:
             type_text = "expenses" if type == 'Expense' else "income" if type == 'Income' else "transactions"
-            await interaction.response.send_message(f"No {type_text} found for {period_text}.")
+            await interaction.followup.send(f"No {type_text} found for {period_text}.")
             return
             
-        total = df['Amount'].sum()
+        total = type_totals.sum()
         type_text = "expenses" if type == 'Expense' else "income" if type == 'Income' else "transactions"
         
-        await interaction.response.send_message(f'Total {type_text} for {period_text}: ${total:.2f}')
+        await interaction.followup.send(f'Total {type_text} for {period_text}: ${total:.2f}')
     except Exception as e:
-        await interaction.response.send_message(f'Error calculating total: {str(e)}')
+        await interaction.followup.send(f'Error calculating total: {str(e)}')
         print(f"Error in total_entries: {e}")
         traceback.print_exc()
 
@@ -496,88 +834,80 @@ async def financial_summary(interaction: discord.Interaction, period: str = 'mon
         await interaction.response.send_message("Google Sheets connection is not available. Please check the bot logs.")
         return
     
+    # Acknowledge right away so slow Sheets calls don't hit Discord's 3 second response limit
+    await interaction.response.defer(thinking=True)
+    
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Get processed records
-        df = get_processed_records()
+        # Get precomputed totals
+        agg = await _sheets_call(get_amount_aggregate)
         
         # Check if there's data
-        if df.empty:
-            await interaction.response.send_message("No transactions found.")
+        if agg.empty:
+            await interaction.followup.send("No transactions found.")
             return
 
-        # Filter by user
-        df = df[df['User'] == str(interaction.user)]
+        # Select this user's totals for the period
+        totals, period_text = get_user_totals(agg, str(interaction.user), period)
         
-        if df.empty:
-            await interaction.response.send_message("You have no recorded transactions.")
+        if totals is None:
+            await interaction.followup.send("You have no recorded transactions.")
             return
-
-        # Filter by period
-        if period.lower() == 'month':
-            current_month = datetime.now().strftime('%Y-%m')
-            df = df[df['Date'].dt.strftime('%Y-%m') == current_month]
-            period_text = 'this month'
-        elif period.lower() == 'week':
-            current_week = datetime.now().isocalendar()[1]
-            df = df[df['Date'].dt.isocalendar().week == current_week]
-            period_text = 'this week'
-        else:
-            period_text = 'all time'
         
         # Check if data exists after filtering by period
-        if df.empty:
-            await interaction.response.send_message(f"No transactions found for {period_text}.")
+        if totals.empty:
+            await interaction.followup.send(f"No transactions found for {period_text}.")
             return
 
         # Create full summary regardless of type parameter
-        income_df = df[df['Type'] == 'Income'].copy()
-        expense_df = df[df['Type'] == 'Expense'].copy()
+        type_totals = totals.groupby(level='Type', observed=True).sum()
         
         # Calculate totals
-        total_income = income_df['Amount'].sum()
-        total_expense = expense_df['Amount'].sum()
+        total_income = type_totals.get('Income', 0)
+        total_expense = type_totals.get('Expense', 0)
         net_balance = total_income - total_expense
         
-        # Build the summary message
-        message = f"**Financial Summary for {period_text}:**\n\n"
+        # Build the summary message as a list of lines, joined once at the end
+        parts = [f"**Financial Summary for {period_text}:**", ""]
         
         # Add Income section if there's income data
-        if not income_df.empty:
-            income_by_category = income_df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-            message += "**💰 Income:**\n"
-            for category, amount in income_by_category.items():
-                message += f"{category}: ${amount:.2f}\n"
-            message += f"**Total Income: ${total_income:.2f}**\n\n"
+        if 'Income' in type_totals.index:
+            income_by_category = totals.xs('Income', level='Type').sort_values(ascending=False)
+            parts.append("**💰 Income:**")
+            parts.extend(f"{category}: ${amount:.2f}" for category, amount in income_by_category.items())
+            parts.append(f"**Total Income: ${total_income:.2f}**")
         else:
-            message += "**💰 Income:** None recorded\n\n"
+            parts.append("**💰 Income:** None recorded")
+        parts.append("")
         
         # Add Expense section if there's expense data
-        if not expense_df.empty:
-            expense_by_category = expense_df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-            message += "**💸 Expenses:**\n"
-            for category, amount in expense_by_category.items():
-                message += f"{category}: ${amount:.2f}\n"
-            message += f"**Total Expenses: ${total_expense:.2f}**\n\n"
+        if 'Expense' in type_totals.index:
+            expense_by_category = totals.xs('Expense', level='Type').sort_values(ascending=False)
+            parts.append("**💸 Expenses:**")
+            parts.extend(f"{category}: ${amount:.2f}" for category, amount in expense_by_category.items())
+            parts.append(f"**Total Expenses: ${total_expense:.2f}**")
         else:
-            message += "**💸 Expenses:** None recorded\n\n"
-        
-        # Add Net Balance section
-        message += f"**⚖️ Net Balance: ${net_balance:.2f}**"
+            parts.append("**💸 Expenses:** None recorded")
+        parts.append("")
         
         # Add indicator based on balance
         if net_balance > 0:
-            message += " ✅"
+            indicator = "✅"
         elif net_balance < 0:
-            message += " ❌"
+            indicator = "❌"
         else:
-            message += " ⚖️"
+            indicator = "⚖️"
+        
+        # Add Net Balance section
+        parts.append(f"**⚖️ Net Balance: ${net_balance:.2f}** {indicator}")
+        message = "\n".join(parts)
         
-        await interaction.response.send_message(message)
+        await interaction.followup.send(message)
     except Exception as e:
-        await interaction.response.send_message(f'Error generating summary: {str(e)}')
+        await interaction.followup.send(f'Error generating summary: {str(e)}')
         print(f"Error in financial_summary: {e}")
         traceback.print_exc()
 
@@ -596,23 +926,27 @@ async def financial_history(interaction: discord.Interaction, limit: int = 5, ty
         await interaction.response.send_message("Google Sheets connection is not available. Please check the bot logs.")
         return
     
+    # Acknowledge right away so slow Sheets calls don't hit Discord's 3 second response limit
+    await interaction.response.defer(thinking=True)
+    
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Get processed records
-        df = get_processed_records()
+        # Get processed records, already sorted newest first
+        df = await _sheets_call(get_records_by_date)
         
         # Check if there's data
         if df.empty:
-            await interaction.response.send_message("No transactions found.")
+            await interaction.followup.send("No transactions found.")
             return
         
         # Filter by user
         df = df[df['User'] == str(interaction.user)]
         
         if df.empty:
-            await interaction.response.send_message("You have no recorded transactions.")
+            await interaction.followup.send("You have no recorded transactions.")
             return
         
         # Filter by transaction type
@@ -622,29 +956,27 @@ async def financial_history(interaction: discord.Interaction, limit: int = 5, ty
         # Check if data exists after filtering
         if df.empty:
             type_text = "expenses" if type == 'Expense' else "income" if type == 'Income' else "transactions"
-            await interaction.response.send_message(f"No {type_text} found.")
+            await interaction.followup.send(f"No {type_text} found.")
             return
             
         # Get the most recent entries
-        recent_entries = df.sort_values('Date', ascending=False).head(limit)
+        recent_entries = df.head(limit)
         
-        message = '**Recent Financial History:**\n'
-        for _, entry in recent_entries.iterrows():
-            amount = entry['Amount']
-            if entry['Type'] == 'Expense':
-                prefix = "💸"
-            else:
-                prefix = "💰"
-                
-            date_str = entry['Date'].strftime('%Y-%m-%d') if pd.notna(entry['Date']) else 'Unknown date'
-            
-            message += f"{prefix} ${amount:.2f} - {entry['Description']} " + \
-                      f"({entry['Category']}) - {date_str} " + \
-                      f"[{entry['Type']}]\n"
+        # Format each column in one pass rather than boxing every row into a Series
+        prefixes = np.where(recent_entries['Type'].eq('Expense'), "💸", "💰")
+        date_strs = recent_entries['Date'].dt.strftime('%Y-%m-%d').fillna('Unknown date')
+        lines = [
+            f"{prefix} ${amount:.2f} - {description} ({category}) - {date_str} [{entry_type}]"
+            for prefix, amount, description, category, date_str, entry_type in zip(
+                prefixes, recent_entries['Amount'], recent_entries['Description'],
+                recent_entries['Category'], date_strs, recent_entries['Type'])
+        ]
+        
+        message = '**Recent Financial History:**\n' + '\n'.join(lines)
         
-        await interaction.response.send_message(message)
+        await interaction.followup.send(message)
     except Exception as e:
-        await interaction.response.send_message(f'Error retrieving history: {str(e)}')
+        await interaction.followup.send(f'Error retrieving history: {str(e)}')
         print(f"Error in financial_history: {e}")
         traceback.print_exc()
 
@@ -690,20 +1022,22 @@ async def set_category_prefix(ctx, entry_id: int, category: str):
     
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Get all values
-        all_values = worksheet.get_all_values()
-        if len(all_values) <= 1:  # Only header row or empty
+        # Count entries from the cached records rather than downloading the whole sheet
+        entry_count = len(await _sheets_call(get_processed_records))
+        if entry_count == 0:
             await ctx.send("No entries found to categorize.")
             return
             
-        if 1 <= entry_id <= len(all_values) - 1:
+        if 1 <= entry_id <= entry_count:
             # Update the category (add 1 because entry_id is 1-indexed, and we skip header row)
-            worksheet.update_cell(entry_id + 1, 4, category)
+            await _sheets_call(_sheets_request, worksheet.update_cell, entry_id + 1, 4, category)
+            update_cached_category(entry_id, category)
             await ctx.send(f'Category for entry #{entry_id} has been set to "{category}"')
         else:
-            await ctx.send(f'Invalid entry ID. Please use a number between 1 and {len(all_values) - 1}')
+            await ctx.send(f'Invalid entry ID. Please use a number between 1 and {entry_count}')
     except Exception as e:
         await ctx.send(f'Error setting category: {str(e)}')
         print(f"Error in set_category_prefix: {e}")
@@ -718,44 +1052,36 @@ async def balance_prefix(ctx, period: str = 'all'):
     
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
-        # Get processed records
-        df = get_processed_records()
+        # Get precomputed totals
+        agg = await _sheets_call(get_amount_aggregate)
         
         # Check if there's data
-        if df.empty:
+        if agg.empty:
             await ctx.send("No transactions found.")
             return
         
-        # Filter by user
-        df = df[df['User'] == str(ctx.author)]
+        # Select this user's totals for the period
+        totals, period_text = get_user_totals(agg, str(ctx.author), period)
         
-        if df.empty:
+        if totals is None:
             await ctx.send("You have no recorded transactions.")
             return
 
-        # Filter by period
-        if period.lower() == 'month':
-            current_month = datetime.now().strftime('%Y-%m')
-            df = df[df['Date'].dt.strftime('%Y-%m') == current_month]
-            period_text = 'this month'
-        elif period.lower() == 'week':
-            current_week = datetime.now().isocalendar()[1]
-            df = df[df['Date'].dt.isocalendar().week == current_week]
-            period_text = 'this week'
-        else:
-            period_text = 'all time'
-
         # Calculate income and expenses
-        income = df[df['Type'] == 'Income']['Amount'].sum()
-        expenses = df[df['Type'] == 'Expense']['Amount'].sum()
+        type_totals = totals.groupby(level='Type', observed=True).sum()
+        income = type_totals.get('Income', 0)
+        expenses = type_totals.get('Expense', 0)
         balance = income - expenses
         
-        message = f"**Balance Summary for {period_text}:**\n"
-        message += f"Total Income: ${income:.2f}\n"
-        message += f"Total Expenses: ${expenses:.2f}\n"
-        message += f"**Net Balance: ${balance:.2f}**"
+        message = "\n".join([
+            f"**Balance Summary for {period_text}:**",
+            f"Total Income: ${income:.2f}",
+            f"Total Expenses: ${expenses:.2f}",
+            f"**Net Balance: ${balance:.2f}**"
+        ])
         
         await ctx.send(message)
     except Exception as e:
@@ -763,205 +1089,260 @@ async def balance_prefix(ctx, period: str = 'all'):
         print(f"Error in balance_prefix: {e}")
         traceback.print_exc()
 
+# Chart colors
+CHART_COLORS = {
+    'Income': '#4CAF50',  # Green
+    'Expense': '#F44336',  # Red
+    'Balance': '#3F51B5',  # Blue
+    'Background': '#2F3136',  # Discord dark theme
+    'Text': '#FFFFFF'      # White text
+}
+
+# matplotlib and seaborn are only imported when the first chart is requested, keeping bot startup light
+_chart_libs_loaded = False
+_chart_libs_lock = threading.Lock()
+
+def _load_chart_libs():
+    global _chart_libs_loaded, matplotlib, sns, mdates, mticker, Figure, FigureCanvasAgg
+    if _chart_libs_loaded:
+        return
+    with _chart_libs_lock:
+        if _chart_libs_loaded:
+            return
+        import matplotlib
+        matplotlib.use('Agg')  # Off-screen rendering only (must be set before seaborn pulls in pyplot)
+        import seaborn as sns
+        import matplotlib.dates as mdates
+        import matplotlib.ticker as mticker
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        # Chart styling is applied once on load rather than on every chart
+        matplotlib.style.use('dark_background')  # Discord dark theme friendly
+        matplotlib.rcParams.update({
+            'text.color': CHART_COLORS['Text'],
+            'axes.labelcolor': CHART_COLORS['Text'],
+            'xtick.color': CHART_COLORS['Text'],
+            'ytick.color': CHART_COLORS['Text']
+        })
+        _chart_libs_loaded = True
+
+# Pie chart palettes, built once per (palette, size) instead of on every chart
+@lru_cache(maxsize=64)
+def get_palette(name, n_colors):
+    return sns.color_palette(name, n_colors)
+
+# One Agg-backed figure and axes per rendering thread, reused across charts (bypasses pyplot entirely)
+_chart_local = threading.local()
+
+def _get_chart_axes():
+    fig = getattr(_chart_local, 'fig', None)
+    if fig is None:
+        fig = Figure(figsize=(10, 6), layout='constrained')  # Laid out at draw time, no tight_layout pass per save
+        FigureCanvasAgg(fig)
+        _chart_local.fig = fig
+        _chart_local.ax = fig.add_subplot(111)
+        return fig, _chart_local.ax
+    
+    # Clearing the axes is far cheaper than building new ones, but some state survives ax.clear()
+    ax = _chart_local.ax
+    ax.clear()
+    ax.set_aspect('auto', adjustable='box')  # Pie charts set an equal aspect
+    ax.set_frame_on(True)  # Pie charts hide the frame
+    ax.set_axisbelow(matplotlib.rcParams['axes.axisbelow'])
+    ax.tick_params(axis='x', labelrotation=0)  # Balance charts rotate the date labels
+    for text in list(fig.texts):  # "No data" messages are figure-level text
+        text.remove()
+    return fig, ax
+
+def _save_chart(fig):
+    """Save the chart to a PNG buffer"""
+    buf = io.BytesIO()
+    # Fast zlib level: PNG stays lossless, encoding is much quicker for a slightly larger file
+    fig.savefig(buf, format='png', dpi=100, pil_kwargs={'compress_level': 1, 'optimize': False})
+    buf.seek(0)
+    return buf
+
+# Placeholder text for charts with nothing to plot, or None if there is data
+def _empty_chart_message(df, chart_type):
+    if chart_type == 'expense_by_category' and (df.empty or 'Expense' not in df['Type'].values):
+        return "No expense data available"
+    if chart_type == 'income_by_category' and (df.empty or 'Income' not in df['Type'].values):
+        return "No income data available"
+    if df.empty:
+        return "No data available"
+    return None
+
+# Placeholder charts are identical every time, so each is rendered once and served from memory
+# (on its own figure, so nothing left over from the thread's last chart gets cached with it)
+@lru_cache(maxsize=None)
+def _render_empty_chart(message):
+    fig = Figure(figsize=(10, 6), layout='constrained')
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    fig.patch.set_facecolor(CHART_COLORS['Background'])
+    ax.set_facecolor(CHART_COLORS['Background'])
+    fig.text(0.5, 0.5, message, ha='center', color=CHART_COLORS['Text'], fontsize=14)
+    return _save_chart(fig).getvalue()
+
 # Helper function to create visualizations
-def generate_chart_image(df, chart_type, period_text):
-    """Generate chart image from dataframe"""
-    plt.figure(figsize=(10, 6))
-    plt.style.use('dark_background')  # Discord dark theme friendly
+def generate_chart_image(df, chart_type, period_text, start_date=None, end_date=None):
+    """Generate chart image from dataframe (start_date/end_date are the inclusive period bounds, if any)"""
+    _load_chart_libs()
+    colors = CHART_COLORS
     
-    # Set default colors
-    colors = {
-        'Income': '#4CAF50',  # Green
-        'Expense': '#F44336',  # Red
-        'Balance': '#3F51B5',  # Blue
-        'Background': '#2F3136',  # Discord dark theme
-        'Text': '#FFFFFF'      # White text
-    }
+    # Nothing to plot: serve the pre-rendered placeholder without building any chart state
+    empty_message = _empty_chart_message(df, chart_type)
+    if empty_message is not None:
+        return io.BytesIO(_render_empty_chart(empty_message))
     
     # Customize figure
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _get_chart_axes()
     fig.patch.set_facecolor(colors['Background'])
     ax.set_facecolor(colors['Background'])
     
-    # Customize text color
-    plt.rcParams['text.color'] = colors['Text']
-    plt.rcParams['axes.labelcolor'] = colors['Text']
-    plt.rcParams['xtick.color'] = colors['Text']
-    plt.rcParams['ytick.color'] = colors['Text']
-    
     # Title based on chart type
     title = f"{chart_type.title()} Overview for {period_text.title()}"
     
     # Financial charts based on type
     if chart_type == 'expense_by_category':
-        if df.empty or 'Expense' not in df['Type'].values:
-            plt.figtext(0.5, 0.5, "No expense data available", ha='center', color=colors['Text'], fontsize=14)
-        else:
-            expense_df = df[df['Type'] == 'Expense']
-            expense_by_cat = expense_df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-            
-            # Create pie chart
-            plt.pie(expense_by_cat, labels=expense_by_cat.index, autopct='%1.1f%%', 
-                    startangle=140, colors=sns.color_palette("hls", len(expense_by_cat)))
-            plt.axis('equal')
-            plt.title(f"Expense Distribution by Category for {period_text.title()}", color=colors['Text'], pad=20)
+        # Select only the two needed columns, group unsorted, then sort the few category totals
+        expense_df = df.loc[df['Type'].values == 'Expense', ['Category', 'Amount']]
+        expense_by_cat = expense_df.groupby('Category', sort=False, observed=True)['Amount'].sum().sort_values(ascending=False)
+        
+        # Create pie chart
+        ax.pie(expense_by_cat, labels=expense_by_cat.index, autopct='%1.1f%%', 
+                startangle=140, colors=get_palette("hls", len(expense_by_cat)))
+        ax.axis('equal')
+        ax.set_title(f"Expense Distribution by Category for {period_text.title()}", color=colors['Text'], pad=20)
     
     elif chart_type == 'income_by_category':
-        if df.empty or 'Income' not in df['Type'].values:
-            plt.figtext(0.5, 0.5, "No income data available", ha='center', color=colors['Text'], fontsize=14)
-        else:
-            income_df = df[df['Type'] == 'Income']
-            income_by_cat = income_df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-            
-            # Create pie chart
-            plt.pie(income_by_cat, labels=income_by_cat.index, autopct='%1.1f%%', 
-                    startangle=140, colors=sns.color_palette("Greens", len(income_by_cat)))
-            plt.axis('equal')
-            plt.title(f"Income Distribution by Category for {period_text.title()}", color=colors['Text'], pad=20)
+        # Select only the two needed columns, group unsorted, then sort the few category totals
+        income_df = df.loc[df['Type'].values == 'Income', ['Category', 'Amount']]
+        income_by_cat = income_df.groupby('Category', sort=False, observed=True)['Amount'].sum().sort_values(ascending=False)
+        
+        # Create pie chart
+        ax.pie(income_by_cat, labels=income_by_cat.index, autopct='%1.1f%%', 
+                startangle=140, colors=get_palette("Greens", len(income_by_cat)))
+        ax.axis('equal')
+        ax.set_title(f"Income Distribution by Category for {period_text.title()}", color=colors['Text'], pad=20)
     
     elif chart_type == 'balance_over_time':
-        if df.empty:
-            plt.figtext(0.5, 0.5, "No data available", ha='center', color=colors['Text'], fontsize=14)
-        else:
-            # Create daily aggregation
-            df['Day'] = df['Date'].dt.date
-            
-            # Get income and expense by day
-            daily_income = df[df['Type'] == 'Income'].groupby('Day')['Amount'].sum().reset_index()
-            daily_expense = df[df['Type'] == 'Expense'].groupby('Day')['Amount'].sum().reset_index()
-            
-            # Create date range for all days in the period
-            if period_text == 'this month':
-                now = datetime.now()
-                _, last_day = monthrange(now.year, now.month)
-                start_date = datetime(now.year, now.month, 1).date()
-                end_date = datetime(now.year, now.month, last_day).date()
-            elif period_text == 'this week':
-                now = datetime.now()
-                start_date = (now - timedelta(days=now.weekday())).date()
-                end_date = now.date()
-            else:
-                if not df.empty:
-                    start_date = df['Date'].min().date()
-                    end_date = df['Date'].max().date()
-                else:
-                    start_date = datetime.now().date()
-                    end_date = datetime.now().date()
-            
-            # Create full date range
-            all_dates = pd.date_range(start=start_date, end=end_date, freq='D')
-            date_df = pd.DataFrame({'Day': all_dates.date})
-            
-            # Merge with income and expense data
-            date_df = date_df.merge(daily_income, on='Day', how='left').rename(columns={'Amount': 'Income'})
-            date_df = date_df.merge(daily_expense, on='Day', how='left').rename(columns={'Amount': 'Expense'})
-            
-            # Fill NaN with 0
-            date_df['Income'] = date_df['Income'].fillna(0)
-            date_df['Expense'] = date_df['Expense'].fillna(0)
-            
-            # Calculate running balance
-            date_df['Balance'] = date_df['Income'] - date_df['Expense']
-            date_df['Cumulative Balance'] = date_df['Balance'].cumsum()
-            
-            # Plot
-            ax.bar(date_df['Day'], date_df['Income'], color=colors['Income'], alpha=0.7, label='Income')
-            ax.bar(date_df['Day'], -date_df['Expense'], color=colors['Expense'], alpha=0.7, label='Expense')
-            ax.plot(date_df['Day'], date_df['Cumulative Balance'], color=colors['Balance'], 
-                    marker='o', linestyle='-', linewidth=2, label='Cumulative Balance')
-            
-            # Format x-axis
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            plt.xticks(rotation=45)
-            
-            # Format y-axis with dollar signs
-            def currency_formatter(x, pos):
-                return f'${abs(x):.0f}'
-            ax.yaxis.set_major_formatter(mticker.FuncFormatter(currency_formatter))
-            
-            # Add legend and grid
-            ax.legend(loc='best', facecolor=colors['Background'])
-            ax.grid(True, linestyle='--', alpha=0.3)
-            ax.set_axisbelow(True)
-            
-            # Add title and labels
-            ax.set_title(f"Income, Expenses and Balance for {period_text.title()}", 
-                        color=colors['Text'], pad=20)
-            ax.set_xlabel('Date', color=colors['Text'])
-            ax.set_ylabel('Amount ($)', color=colors['Text'])
+        # Create date range for all days in the period (all-time charts span the first to last entry)
+        if start_date is None:
+            start_date = df['Date'].min().date()
+            end_date = df['Date'].max().date()
+        
+        # Create full date range
+        all_dates = pd.date_range(start=start_date, end=end_date, freq='D')
+        n_days = len(all_dates)
+        
+        # Bucket entries by day offset from the start of the range, dropping undated rows first
+        # (subtracting from the NaT sentinel would overflow) and then out-of-range days
+        days = df['_Day'].values
+        valid = days != NAT_DAY
+        day_idx = days[valid] - _day_number(start_date)
+        in_range = (day_idx >= 0) & (day_idx < n_days)
+        amounts = df['Amount'].values[valid]
+        types = df['Type'].values[valid]
+        is_income = in_range & (types == 'Income')
+        is_expense = in_range & (types == 'Expense')
+        
+        # Sum income and expense per day (days without entries become 0)
+        daily_income = np.bincount(day_idx[is_income], weights=amounts[is_income], minlength=n_days)
+        daily_expense = np.bincount(day_idx[is_expense], weights=amounts[is_expense], minlength=n_days)
+        
+        # Calculate running balance
+        cumulative_balance = np.cumsum(daily_income - daily_expense)
+        
+        # Plot
+        ax.bar(all_dates, daily_income, color=colors['Income'], alpha=0.7, label='Income')
+        ax.bar(all_dates, -daily_expense, color=colors['Expense'], alpha=0.7, label='Expense')
+        ax.plot(all_dates, cumulative_balance, color=colors['Balance'], 
+                marker='o', linestyle='-', linewidth=2, label='Cumulative Balance')
+        
+        # Format x-axis
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+        ax.tick_params(axis='x', labelrotation=45)
+        
+        # Format y-axis with dollar signs
+        def currency_formatter(x, pos):
+            return f'${abs(x):.0f}'
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(currency_formatter))
+        
+        # Add legend and grid
+        ax.legend(loc='best', facecolor=colors['Background'])
+        ax.grid(True, linestyle='--', alpha=0.3)
+        ax.set_axisbelow(True)
+        
+        # Add title and labels
+        ax.set_title(f"Income, Expenses and Balance for {period_text.title()}", 
+                    color=colors['Text'], pad=20)
+        ax.set_xlabel('Date', color=colors['Text'])
+        ax.set_ylabel('Amount ($)', color=colors['Text'])
     
     elif chart_type == 'income_vs_expense':
         # Summary bar chart comparing income vs. expense
-        if df.empty:
-            plt.figtext(0.5, 0.5, "No data available", ha='center', color=colors['Text'], fontsize=14)
-        else:
-            # Calculate totals by type
-            totals = df.groupby('Type')['Amount'].sum()
-            
-            # Default values if either category is missing
-            income_total = totals.get('Income', 0)
-            expense_total = totals.get('Expense', 0)
-            balance = income_total - expense_total
-            
-            # Plot
-            categories = ['Income', 'Expense', 'Balance']
-            values = [income_total, expense_total, balance]
-            bar_colors = [colors['Income'], colors['Expense'], 
-                        colors['Balance'] if balance >= 0 else '#F44336']
-            
-            # Create bar chart
-            bars = ax.bar(categories, values, color=bar_colors, width=0.6)
-            
-            # Add data labels on top of bars
-            for bar in bars:
-                height = bar.get_height()
-                label_text = f'${abs(height):.2f}'
-                ax.annotate(label_text,
-                            xy=(bar.get_x() + bar.get_width() / 2, height),
-                            xytext=(0, 3),  # 3 points vertical offset
-                            textcoords="offset points",
-                            ha='center', va='bottom',
-                            color=colors['Text'])
-            
-            # Customize the plot
-            ax.set_title(f"Financial Summary for {period_text.title()}", color=colors['Text'], pad=20)
-            ax.set_ylabel('Amount ($)', color=colors['Text'])
-            ax.grid(True, linestyle='--', alpha=0.3, axis='y')
-            ax.set_axisbelow(True)
-    
-    # Save the chart to a buffer
-    buf = io.BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format='png', dpi=100)
-    buf.seek(0)
-    plt.close(fig)
+        # Calculate totals by type
+        totals = df.groupby('Type', sort=False, observed=True)['Amount'].sum()
+        
+        # Default values if either category is missing
+        income_total = totals.get('Income', 0)
+        expense_total = totals.get('Expense', 0)
+        balance = income_total - expense_total
+        
+        # Plot
+        categories = ['Income', 'Expense', 'Balance']
+        values = [income_total, expense_total, balance]
+        bar_colors = [colors['Income'], colors['Expense'], 
+                    colors['Balance'] if balance >= 0 else '#F44336']
+        
+        # Create bar chart
+        bars = ax.bar(categories, values, color=bar_colors, width=0.6)
+        
+        # Add data labels on top of bars (3 points above each bar)
+        ax.bar_label(bars, labels=[f'${abs(v):.2f}' for v in values], padding=3, color=colors['Text'])
+        
+        # Customize the plot
+        ax.set_title(f"Financial Summary for {period_text.title()}", color=colors['Text'], pad=20)
+        ax.set_ylabel('Amount ($)', color=colors['Text'])
+        ax.grid(True, linestyle='--', alpha=0.3, axis='y')
+        ax.set_axisbelow(True)
     
-    return buf
+    return _save_chart(fig)
 
 async def filter_data_by_period(df, interaction, period='month'):
-    """Filter data by period and user"""
+    """Filter data by period and user, returning the inclusive period start/end dates alongside"""
     if df.empty:
-        return df, "No data"
+        return df, "No data", None, None
+    
+    # Reuse the slice from an earlier chart until the records change (or the day rolls over)
+    user_key = str(interaction.user)
+    cache_key = (user_key, period.lower(), date.today().isoformat())
+    cached = _slice_cache.get(cache_key)
+    if cached is not None:
+        return (cached[0].copy(deep=False),) + cached[1:]
     
-    # Filter by user
-    df = df[df['User'] == str(interaction.user)]
+    # Filter by user on the categorical codes (a user with no records has no code)
+    users = df['User'].cat
+    try:
+        user_code = users.categories.get_loc(user_key)
+    except KeyError:
+        return df.iloc[:0], "No user data", None, None
+    df = df[users.codes.values == user_code]
     
     if df.empty:
-        return df, "No user data"
+        return df, "No user data", None, None
     
-    # Filter by period
-    if period.lower() == 'month':
-        current_month = datetime.now().strftime('%Y-%m')
-        df = df[df['Date'].dt.strftime('%Y-%m') == current_month]
-        period_text = 'this month'
-    elif period.lower() == 'week':
-        current_week = datetime.now().isocalendar()[1]
-        df = df[df['Date'].dt.isocalendar().week == current_week]
-        period_text = 'this week'
-    else:
-        period_text = 'all time'
+    # Filter by period, using the same bounds for the chart's date axis
+    now = datetime.now()
+    start, end, _ = get_period_bounds(period, now)
+    df, period_text = filter_by_period(df, period, now)
+    start_date = start.date() if start is not None else None
+    end_date = (end - pd.Timedelta(days=1)).date() if end is not None else None
     
-    return df, period_text
+    _slice_cache[cache_key] = (df, period_text, start_date, end_date)
+    return df.copy(deep=False), period_text, start_date, end_date
 
 @bot.tree.command(name="chart", description="Generate financial charts and visualizations")
 @app_commands.describe(
@@ -989,20 +1370,21 @@ async def financial_chart(interaction: discord.Interaction, chart_type: str, per
     
     try:
         # Ensure headers first
-        ensure_headers()
+        if not _headers_ok:
+            await _sheets_call(ensure_headers_once)
         
         # Get processed records
-        df = get_processed_records()
+        df = await _sheets_call(get_processed_records)
         
         # Filter data by period and user
-        filtered_df, period_text = await filter_data_by_period(df, interaction, period)
+        filtered_df, period_text, start_date, end_date = await filter_data_by_period(df, interaction, period)
         
         if filtered_df.empty:
             await interaction.followup.send(f"No data available for {period_text}.")
             return
         
-        # Generate chart image
-        chart_buffer = generate_chart_image(filtered_df, chart_type, period_text)
+        # Generate chart image in a worker thread so rendering doesn't block the event loop
+        chart_buffer = await asyncio.to_thread(generate_chart_image, filtered_df, chart_type, period_text, start_date, end_date)
         
         # Create a discord file from the buffer
         chart_file = discord.File(fp=chart_buffer, filename="financial_chart.png")
@@ -1022,12 +1404,13 @@ async def financial_chart(interaction: discord.Interaction, chart_type: str, per
 # Inside your existing bot code, create UI classes for buttons
 
 class ExpenseConfirmView(discord.ui.View):
-    def __init__(self, original_interaction, amount, description, category):
+    def __init__(self, original_interaction, amount, description, category, recorded_at):
         super().__init__(timeout=180)
         self.original_interaction = original_interaction
         self.amount = amount
         self.description = description
         self.category = category
+        self.recorded_at = recorded_at  # Date cell of the queued row, used to find it again on undo
         
     @discord.ui.button(label="View Report", style=discord.ButtonStyle.primary, emoji="📊")
     async def view_report(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -1036,7 +1419,7 @@ class ExpenseConfirmView(discord.ui.View):
         
         # Get data from Google Sheet
         # (This would use your existing get_processed_records function)
-        df = get_processed_records()
+        df = await _sheets_call(get_processed_records)
         df = df[df['User'] == str(interaction.user)]
         
         # Calculate total
@@ -1046,12 +1429,12 @@ class ExpenseConfirmView(discord.ui.View):
         embed.add_field(name="Total Spent", value=f"₹{total_spent}", inline=False)
         
         # Get expenses by category
-        expenses_by_category = df[df['Type'] == 'Expense'].groupby('Category')['Amount'].sum()
+        expenses_by_category = df[df['Type'] == 'Expense'].groupby('Category', observed=True)['Amount'].sum()
         for category, amount in expenses_by_category.items():
             embed.add_field(name=f"{category}", value=f"₹{amount}", inline=True)
             
         # Add chart (using your existing chart function)
-        chart_buffer = generate_chart_image(df, "expense_by_category", "this month")
+        chart_buffer = await asyncio.to_thread(generate_chart_image, df, "expense_by_category", "this month")
         chart_file = discord.File(fp=chart_buffer, filename="expense_chart.png")
         embed.set_image(url="attachment://expense_chart.png")
         
@@ -1060,7 +1443,7 @@ class ExpenseConfirmView(discord.ui.View):
     @discord.ui.button(label="Budget Status", style=discord.ButtonStyle.success, emoji="💰")
     async def budget_status(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Create budget status embed
-        df = get_processed_records()
+        df = await _sheets_call(get_processed_records)
         df = df[df['User'] == str(interaction.user)]
         
         income = df[df['Type'] == 'Income']['Amount'].sum()
@@ -1081,22 +1464,29 @@ class ExpenseConfirmView(discord.ui.View):
         
     @discord.ui.button(label="Undo", style=discord.ButtonStyle.danger, emoji="↩️")
     async def undo(self, interaction: discord.Interaction, button: discord.ui.Button):
-        # Delete the last entry for this user
-        # This would need access to your Google Sheet
+        # Delete the entry this confirmation was for
+        await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            # Get all values and find the last entry from this user
-            all_values = worksheet.get_all_values()
-            user_entries = [i for i, row in enumerate(all_values) if row[0] == str(interaction.user)]
+            # The row may still be queued, so wait for pending writes before looking for it
+            await flush_writes()
+            
+            # Get all values and find this user's entry by its timestamp
+            all_values = await _sheets_call(_sheets_request, worksheet.get_all_values)
+            user_key = str(interaction.user)
+            user_entries = [i for i, row in enumerate(all_values)
+                            if len(row) >= 6 and row[0] == user_key and row[5] == self.recorded_at]
             
             if user_entries:
-                last_entry_index = user_entries[-1]
+                entry_index = user_entries[-1]
                 # Delete the row (add 1 because sheets are 1-indexed)
-                worksheet.delete_row(last_entry_index + 1)
-                await interaction.response.send_message("✅ Last expense entry deleted!", ephemeral=True)
+                await _sheets_call(_sheets_request, worksheet.delete_row, entry_index + 1)
+                invalidate_cache()
+                await interaction.followup.send("✅ Expense entry deleted!", ephemeral=True)
             else:
-                await interaction.response.send_message("❌ No entries found to delete.", ephemeral=True)
+                await interaction.followup.send("❌ This entry was not saved, so there is nothing to delete.", ephemeral=True)
         except Exception as e:
-            await interaction.response.send_message(f"Error undoing entry: {str(e)}", ephemeral=True)
+            await interaction.followup.send(f"Error undoing entry: {str(e)}", ephemeral=True)
 
 # Run the bot
-bot.run(os.getenv('DISCORD_TOKEN')) 
\ No newline at end of file
+if __name__ == '__main__':
+    bot.run(os.getenv('DISCORD_TOKEN')) 
\ No newline at end of file
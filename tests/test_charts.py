@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+from unittest import mock
+
+import pytest
+
+for module in ('discord', 'gspread', 'oauth2client', 'numpy', 'pandas', 'pyarrow', 'matplotlib', 'seaborn', 'dotenv'):
+    pytest.importorskip(module)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='module')
+def bot():
+    # Importing bot connects to Google Sheets at module level, so hand it a fake client
+    with mock.patch('oauth2client.service_account.ServiceAccountCredentials.from_json_keyfile_name'), \
+            mock.patch('gspread.authorize'):
+        import bot
+    return bot
+
+
+@pytest.fixture
+def records(bot):
+    rows = [
+        ['alice', '120.50', 'Pay', 'Salary', 'Income', '2024-03-01 09:00:00'],
+        ['alice', '15.25', 'Lunch', 'Food', 'Expense', '2024-03-02 12:30:00'],
+        ['alice', '40', 'Bus pass', 'Transportation', 'Expense', '2024-03-04 08:15:00'],
+    ]
+    return bot._build_records_frame(rows, bot.HEADERS)
+
+
+def _in_new_thread(fn):
+    """Run fn on a fresh thread, so it gets its own (new) per-thread chart figure"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_chart_state_does_not_leak_between_charts(bot, records):
+    def render(chart_type):
+        return bot.generate_chart_image(records, chart_type, 'all time').getvalue()
+
+    fresh = _in_new_thread(lambda: render('income_vs_expense'))
+
+    def after_balance_chart():
+        render('balance_over_time')
+        return render('income_vs_expense'), render('income_vs_expense')
+
+    first, second = _in_new_thread(after_balance_chart)
+    assert first == fresh
+    assert second == fresh
+
+
+def test_placeholder_does_not_depend_on_previous_chart(bot, records):
+    expenses_only = records[records['Type'] == 'Expense']
+
+    def render_placeholder():
+        bot._render_empty_chart.cache_clear()
+        return bot.generate_chart_image(expenses_only, 'income_by_category', 'all time').getvalue()
+
+    fresh = _in_new_thread(render_placeholder)
+
+    def after_balance_chart():
+        bot.generate_chart_image(records, 'balance_over_time', 'all time')
+        return render_placeholder()
+
+    assert _in_new_thread(after_balance_chart) == fresh